@@ -3,12 +3,118 @@
 Converter script to generate Python interface for the econfmanager C library.
 
 This script parses the C header file and generates a Python script that creates
-a ctypes-based interface to the C library.
+a ctypes-based interface to the C library. With --backend=cffi the interface is
+built on cffi instead, and with --backend=cython a Cython .pyx module is emitted.
+
+The generator is plain Python without CPython-specific dependencies. Run under
+PyPy for best performance on large headers.
 """
 
+import argparse
+import ast
+import hashlib
+import logging
+import operator
+import os
+import pickle
 import re
 import sys
-from typing import List, Dict, Tuple
+import tempfile
+from typing import Callable, List, Dict, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Supported FFI backends for the generated interface
+BACKENDS = ("ctypes", "cffi", "cython")
+
+# Number of parsed headers kept in the parse cache
+PARSE_CACHE_MAX_ENTRIES = 64
+
+# Patterns used by parse_header, compiled once at import time
+_ENUM_RE = re.compile(
+    r'typedef\s+enum\s*{\s*([^}]*)\s*}\s*(\w+)\s*;',
+    re.DOTALL
+)
+_STRUCT_RE = re.compile(
+    r'typedef\s+struct\s+(\w+)\s*{\s*([^}]*)\s*}\s*(\w+)\s*;',
+    re.DOTALL
+)
+_TYPEDEF_RE = re.compile(
+    r'typedef\s+([^\s]+(?:\s*\*)?)\s+(\w+)\s*;'
+)
+_FUNC_RE = re.compile(
+    r'(\w+)\s+(\w+)\(([^)]*)\)\s*;'
+)
+
+# Patterns used to reduce the header to plain C declarations
+_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_LINE_COMMENT_RE = re.compile(r'//[^\n]*')
+_CPLUSPLUS_GUARD_RE = re.compile(r'#ifdef\s+__cplusplus\b.*?#endif', re.DOTALL)
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+_STATEMENT_TOKEN_RE = re.compile(r'[{};]')
+_IDENTIFIER_RE = re.compile(r'\b[A-Za-z_]\w*\b')
+
+# C integer literal suffixes (1u, 0x10UL) dropped before evaluating enum values
+_INT_SUFFIX_RE = re.compile(r'\b((?:0[xX][0-9a-fA-F]+)|\d+)[uUlL]+\b')
+
+# Operators allowed in enum value expressions
+_ENUM_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+    ast.Invert: operator.invert,
+}
+_ENUM_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.LShift: operator.lshift,
+    ast.RShift: operator.rshift,
+    ast.BitOr: operator.or_,
+    ast.BitAnd: operator.and_,
+    ast.BitXor: operator.xor,
+}
+
+def strip_preprocessor(header_content: str) -> str:
+    """
+    Reduce the header to plain C declarations, as accepted by cffi's cdef().
+
+    Args:
+        header_content: Content of the header file
+
+    Returns:
+        Header content without comments, C++ guards and preprocessor directives
+    """
+    text = _BLOCK_COMMENT_RE.sub('', header_content)
+    text = _LINE_COMMENT_RE.sub('', text)
+    text = _CPLUSPLUS_GUARD_RE.sub('', text)
+    lines = [line.rstrip() for line in text.split('\n') if not line.lstrip().startswith('#')]
+    return _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip() + '\n'
+
+def split_statements(text: str) -> List[str]:
+    """
+    Split C declarations into top-level statements.
+
+    Semicolons inside braces (struct fields) do not end a statement.
+
+    Args:
+        text: C declarations without comments or preprocessor directives
+
+    Returns:
+        List of stripped statements, each including its trailing semicolon
+    """
+    statements = []
+    depth = 0
+    start = 0
+    for match in _STATEMENT_TOKEN_RE.finditer(text):
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+        elif depth == 0:
+            statements.append(text[start:match.end()].strip())
+            start = match.end()
+    return statements
 
 def parse_header(header_content: str) -> Tuple[Dict, List, List, List, Dict]:
     """
@@ -25,116 +131,379 @@ def parse_header(header_content: str) -> Tuple[Dict, List, List, List, Dict]:
     """
     enums = {}
     structs = []
+    typedefs = []
+    typedef_map = {}
     functions = []
 
-    # Parse enums
-    enum_pattern = re.compile(
-        r'typedef\s+enum\s*{\s*([^}]*)\s*}\s*(\w+)\s*;',
-        re.DOTALL
-    )
+    # Dispatch each top-level statement to the matching pattern instead of
+    # scanning the whole header once per pattern
+    for statement in split_statements(strip_preprocessor(header_content)):
+        if statement.startswith('typedef'):
+            # Parse enums
+            if statement.startswith('typedef enum'):
+                match = _ENUM_RE.match(statement)
+                if match:
+                    _parse_enum(match, enums)
+                    continue
+
+            # Parse structs
+            if statement.startswith('typedef struct'):
+                match = _STRUCT_RE.match(statement)
+                if match:
+                    struct_name = match.group(3)
+                    struct_content = match.group(2).strip()
+                    structs.append((struct_name, struct_content))
+                    continue
+
+            # Parse typedefs and build typedef_map
+            match = _TYPEDEF_RE.match(statement)
+            if match:
+                base_type = match.group(1).strip()
+                alias = match.group(2).strip()
+                typedefs.append(f"{base_type} {alias}")
+                typedef_map[alias] = base_type
+            continue
+
+        # Parse function declarations
+        match = _FUNC_RE.search(statement)
+        if match:
+            functions.append(_parse_function(match))
 
-    for match in enum_pattern.finditer(header_content):
-        enum_name = match.group(2)
-        enum_values = {}
+    return enums, structs, typedefs, functions, typedef_map
 
-        for item in match.group(1).split(','):
-            item = item.strip()
-            if not item:
-                continue
+def _parse_enum(match: re.Match, enums: Dict) -> None:
+    """
+    Parse a matched enum typedef into the enums dictionary.
 
-            # Handle both simple and complex enum items
-            if '=' in item:
-                name, value = item.split('=', 1)
-                name = name.strip()
-                value = value.strip().rstrip(',')
-                enum_values[name] = value
-            else:
-                name = item.rstrip(',').strip()
-                enum_values[name] = None
+    Args:
+        match: _ENUM_RE match of the enum typedef
+        enums: Dictionary of enums to add the enum to
+    """
+    enum_name = match.group(2)
+    enum_values = {}
 
-        enums[enum_name] = enum_values
+    for item in map(str.strip, match.group(1).split(',')):
+        if not item:
+            continue
 
-    # Parse structs
-    struct_pattern = re.compile(
-        r'typedef\s+struct\s+(\w+)\s*{\s*([^}]*)\s*}\s*(\w+)\s*;',
-        re.DOTALL
-    )
+        # Handle both simple and complex enum items
+        eq = item.find('=')
+        if eq >= 0:
+            enum_values[item[:eq].rstrip()] = item[eq + 1:].strip()
+        else:
+            enum_values[item] = None
 
-    for match in struct_pattern.finditer(header_content):
-        struct_name = match.group(3)
-        struct_content = match.group(2).strip()
-        structs.append((struct_name, struct_content))
+    enums[enum_name] = enum_values
 
-    # Parse typedefs and build typedef_map
-    typedef_pattern = re.compile(
-        r'typedef\s+([^\s]+(?:\s*\*)?)\s+(\w+)\s*;'
-    )
+def _parse_function(match: re.Match) -> Dict:
+    """
+    Parse a matched function declaration.
 
-    typedefs = []
-    typedef_map = {}
-    for match in typedef_pattern.finditer(header_content):
-        base_type = match.group(1).strip()
-        alias = match.group(2).strip()
-        typedefs.append(f"{base_type} {alias}")
-        typedef_map[alias] = base_type
-
-    # Parse function declarations
-    func_pattern = re.compile(
-        r'(\w+)\s+(\w+)\(([^)]*)\)\s*;'
-    )
-
-    for match in func_pattern.finditer(header_content):
-        return_type = match.group(1)
-        func_name = match.group(2)
-        params = []
-
-        # Extract parameters with their names and types
-        for p in match.group(3).split(','):
-            p = p.strip()
-            if not p:
-                continue
+    Args:
+        match: _FUNC_RE match of the function declaration
 
-            # Extract parameter type and name
-            param_parts = re.split('[ *]', p)
-            print(f"Param parts: {param_parts}")
-
-            # Handle const char* special case
-            if len(param_parts) >= 4 and param_parts[0] == 'const' and param_parts[1] == 'char':
-                param_type = 'const char*'
-                param_name = param_parts[-1] if len(param_parts) > 2 else 'str_ptr'
-            # Handle pointer types
-            elif '*' in p:
-                # Find the last space before the *
-                last_space = p.rfind(' ', 0, p.find('*'))
-                if last_space > 0:
-                    param_name = p[last_space+1:].strip().replace('*', '')
-                    param_type = p[:last_space].strip()
-                else:
-                    param_name = p.strip() if len(param_parts) > 1 else f"arg"
-                    param_type = f"{param_type.replace('*', '')}_ptr"
-            # Handle regular types
+    Returns:
+        Dictionary with the return type, name and parameters of the function
+    """
+    return_type = match.group(1)
+    func_name = match.group(2)
+    params = []
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    # Extract parameters with their names and types
+    for p in match.group(3).split(','):
+        p = p.strip()
+        if not p:
+            continue
+
+        # Extract parameter type and name
+        param_parts = p.replace('*', ' ').split()
+        if debug:
+            logger.debug("Param parts: %s", param_parts)
+
+        # Handle const char* special case
+        if len(param_parts) >= 3 and param_parts[0] == 'const' and param_parts[1] == 'char' and '*' in p:
+            param_type = 'const char*'
+            param_name = param_parts[-1] if len(param_parts) > 2 else 'str_ptr'
+        # Handle pointer types
+        elif '*' in p:
+            # Find the last space before the *
+            last_space = p.rfind(' ', 0, p.find('*'))
+            if last_space > 0:
+                param_name = p[last_space+1:].strip().replace('*', '')
+                param_type = p[:last_space].strip()
             else:
-                param_type = param_parts[-2]
-                param_name = param_parts[-1] if len(param_parts) > 1 else f"arg"
-
-            print(f"Param: type `{param_type}` name `{param_name}`")
-
-            # Store the parameter as a dictionary with type and name
-            params.append({
-                'type': param_type,
-                'name': param_name,
-                'full': p
-            })
-
-        functions.append({
-            'return_type': return_type,
-            'name': func_name,
-            'params': params
+                param_name = p.strip() if len(param_parts) > 1 else f"arg"
+                param_type = f"{param_type.replace('*', '')}_ptr"
+        # Handle regular types
+        else:
+            param_type = param_parts[-2]
+            param_name = param_parts[-1] if len(param_parts) > 1 else f"arg"
+
+        if debug:
+            logger.debug("Param: type `%s` name `%s`", param_type, param_name)
+
+        # Store the parameter as a dictionary with type and name
+        params.append({
+            'type': param_type,
+            'name': param_name,
+            'full': p
         })
 
-    return enums, structs, typedefs, functions, typedef_map
+    return {
+        'return_type': return_type,
+        'name': func_name,
+        'params': params
+    }
+
+def resolve_typedef_chains(typedef_map: Dict) -> Dict:
+    """
+    Resolve every typedef alias to the terminal type of its typedef chain.
 
-def generate_python_interface(enums: Dict, structs: List, typedefs: List, functions: List, typedef_map: Dict) -> str:
+    Args:
+        typedef_map: Mapping of custom typedefs to base types
+
+    Returns:
+        Mapping of each alias to its fully resolved base type
+    """
+    resolved_typedefs = {}
+    for alias in typedef_map:
+        t = alias
+        visited = set()
+        # Stop on cyclic typedefs instead of looping forever
+        while t in typedef_map and t not in visited:
+            visited.add(t)
+            t = typedef_map[t]
+        resolved_typedefs[alias] = t
+    return resolved_typedefs
+
+# --- Type mapping for C types to ctypes ---
+CTYPE_MAP = {
+    "void": "None",
+    "void*": "c_void_p",
+    "const void*": "c_void_p",
+    "char": "c_char",
+    "char*": "c_char_p",
+    "const char*": "c_char_p",
+    "int": "c_int",
+    "int32_t": "c_int32",
+    "int64_t": "c_int64",
+    "uint32_t": "c_uint32",
+    "uint64_t": "c_uint64",
+    "uintptr_t": "c_size_t",
+    "bool": "c_bool",
+    "size_t": "c_size_t",
+    "float": "c_float",
+    "double": "c_double",
+}
+
+# C types mapped to Python int and float type hints
+_INT_TYPES = frozenset(("int", "int32_t", "int64_t", "uint32_t", "uint64_t", "uintptr_t", "size_t"))
+_FLOAT_TYPES = frozenset(("float", "double"))
+
+# Scalar C types the Cython backend can pass by value
+_CYTHON_SCALARS = _INT_TYPES | _FLOAT_TYPES | {"char", "bool", "int8_t", "uint8_t", "int16_t", "uint16_t"}
+
+def make_type_resolvers(enums: Dict, typedef_map: Dict) -> Tuple[Callable[..., str], Callable[[str], str]]:
+    """
+    Build the C type resolvers shared by all code generation backends.
+
+    Args:
+        enums: Dictionary of enums
+        typedef_map: Mapping of custom typedefs to base types
+
+    Returns:
+        Tuple containing:
+        - Function mapping a C type to a ctypes type expression
+        - Function mapping a C type to a Python type hint
+    """
+    resolved_typedefs = resolve_typedef_chains(typedef_map)
+
+    # Both resolvers are pure functions of their arguments and are called with
+    # the same few types for every function, so memoize them per generation run
+    resolve_cache: Dict[Tuple[str, bool], str] = {}
+    pytype_cache: Dict[str, str] = {}
+
+    def resolve_ctype(c_type: str, is_return: bool = False) -> str:
+        key = (c_type, is_return)
+        resolved = resolve_cache.get(key)
+        if resolved is None:
+            resolved = resolve_cache[key] = _resolve_ctype(c_type, is_return)
+        return resolved
+
+    def ctype_to_pytype(c_type: str) -> str:
+        pytype = pytype_cache.get(c_type)
+        if pytype is None:
+            pytype = pytype_cache[c_type] = _ctype_to_pytype(c_type)
+        return pytype
+
+    def _resolve_ctype(c_type: str, is_return: bool) -> str:
+        t = c_type.strip()
+        t = t.replace("const ", "")
+        # Handle pointer types
+        if t.endswith("**"):
+            base = t[:-2].strip()
+            resolved = resolve_ctype(typedef_map.get(base, base))
+            return f"POINTER({resolved})"
+        if t.endswith("*"):
+            base = t[:-1].strip()
+            # Special case for char* (string)
+            if base == "char":
+                return "c_char_p"
+            resolved = resolve_ctype(typedef_map.get(base, base))
+            return f"POINTER({resolved})"
+        # Resolve typedefs
+        t = resolved_typedefs.get(t, t)
+        # Special case for enums (use c_int)
+        if t in enums:
+            return "c_int"
+        # Only use None for void return type, not for arguments
+        if t == "void":
+            return "None" if is_return else "c_void_p"
+        return CTYPE_MAP.get(t, f"c_void_p")
+
+    def _ctype_to_pytype(c_type: str) -> str:
+        t = c_type.strip()
+        t = t.replace("const ", "")
+        if t.endswith("*"):
+            base = t[:-1].strip()
+            if base == "char":
+                return "str"
+            return "Any"
+        # Resolve typedefs
+        t = resolved_typedefs.get(t, t)
+        if t in enums:
+            return "int"
+        if t in _INT_TYPES:
+            return "int"
+        if t in _FLOAT_TYPES:
+            return "float"
+        if t == "bool":
+            return "bool"
+        return "Any"
+
+    return resolve_ctype, ctype_to_pytype
+
+def eval_enum_value(expr: str, names: Dict[str, int]) -> Optional[int]:
+    """
+    Evaluate a C enum value expression to an integer.
+
+    Supports integer literals (with C suffixes), previously defined enum
+    values, parentheses and the arithmetic, bitwise and shift operators.
+
+    Args:
+        expr: C expression of the enum value
+        names: Already evaluated enum values
+
+    Returns:
+        Integer value, or None if the expression cannot be evaluated
+    """
+    try:
+        tree = ast.parse(_INT_SUFFIX_RE.sub(r'\1', expr.strip()), mode='eval')
+    except SyntaxError:
+        return None
+
+    def evaluate(node: ast.AST) -> int:
+        if isinstance(node, ast.Constant) and type(node.value) is int:
+            return node.value
+        if isinstance(node, ast.Name) and node.id in names:
+            return names[node.id]
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _ENUM_UNARY_OPS:
+            return _ENUM_UNARY_OPS[type(node.op)](evaluate(node.operand))
+        if isinstance(node, ast.BinOp) and type(node.op) in _ENUM_BINARY_OPS:
+            return _ENUM_BINARY_OPS[type(node.op)](evaluate(node.left), evaluate(node.right))
+        raise ValueError(f"Unsupported enum expression: {expr}")
+
+    try:
+        return evaluate(tree.body)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+def _generate_enum_classes(out: TextIO, enums: Dict, indent: str = "    ") -> None:
+    """
+    Write the IntEnum definitions.
+
+    Values are evaluated by the generator and emitted with the IntEnum
+    functional API as plain integers. An enum with a value that cannot be
+    evaluated is emitted as a class body instead, where the verbatim
+    expressions can still refer to the preceding members.
+
+    Args:
+        out: File-like object the generated code is written to
+        enums: Dictionary of enums
+        indent: Indentation of the definitions (nested in EconfManager by default)
+    """
+    names: Dict[str, int] = {}
+    for enum_name, enum_values in enums.items():
+        members = []
+        evaluated = True
+        previous_name = None
+        for value_name, value in enum_values.items():
+            if value is None:
+                # Enums without explicit values continue from the previous value as in C
+                value = "0" if previous_name is None else f"{previous_name} + 1"
+            number = eval_enum_value(value, names)
+            if number is None:
+                evaluated = False
+            else:
+                names[value_name] = number
+                value = str(number)
+            members.append((value_name, value))
+            previous_name = value_name
+
+        out.write(f"\n{indent}# {enum_name} enum\n")
+        if not evaluated:
+            out.write(f"{indent}class {enum_name}(IntEnum):\n")
+            for value_name, value in members:
+                out.write(f"{indent}    {value_name} = {value}\n")
+            continue
+
+        # Pass the module explicitly: the functional API otherwise guesses it from
+        # the caller's frame, which fails in compiled Cython modules. Nested
+        # enums also keep their EconfManager.<Name> qualname so they stay picklable
+        qualname = ", module=__name__"
+        if indent:
+            qualname += f", qualname=\"EconfManager.{enum_name}\""
+        out.write(f"{indent}{enum_name} = IntEnum(\"{enum_name}\", {{\n")
+        for value_name, value in members:
+            out.write(f"{indent}    \"{value_name}\": {value},\n")
+        out.write(f"{indent}}}{qualname})\n")
+
+# Source of one EconfManager wrapper method, see _generate_wrapper_methods
+_WRAPPER_TPL = '''
+    def {name}(self{sig}) -> {ret}:
+        """
+        Wrapper for {name} function.
+
+        Args:
+{docs}
+        Returns:
+            {ret} result from the C function
+        """
+        return self.lib.{name}({args})
+'''
+
+def _generate_wrapper_methods(out: TextIO, functions: List, ctype_to_pytype: Callable[[str], str]) -> None:
+    """
+    Write the EconfManager wrapper methods forwarding calls to self.lib.
+
+    Args:
+        out: File-like object the generated code is written to
+        functions: List of function declarations
+        ctype_to_pytype: Function mapping a C type to a Python type hint
+    """
+    for func in functions:
+        params = func['params']
+        ret = ctype_to_pytype(func['return_type'])
+        out.write(_WRAPPER_TPL.format(
+            name=func['name'],
+            sig="".join(f", {param['name']}: {ctype_to_pytype(param['type'])}" for param in params),
+            ret=ret,
+            docs="".join(f"            {param['name']} ({param['full']}): Parameter\n" for param in params),
+            args=", ".join(param['name'] for param in params),
+        ))
+
+def generate_python_interface(enums: Dict, structs: List, typedefs: List, functions: List, typedef_map: Dict, out: TextIO) -> None:
     """
     Generate Python interface code using ctypes.
 
@@ -144,11 +513,9 @@ def generate_python_interface(enums: Dict, structs: List, typedefs: List, functi
         typedefs: List of typedefs
         functions: List of function declarations
         typedef_map: Mapping of custom typedefs to base types
-
-    Returns:
-        Generated Python code as a string
+        out: File-like object the generated code is written to
     """
-    python_code = """#!/usr/bin/env python3
+    out.write("""#!/usr/bin/env python3
 \"\"\"
 Python interface for the econfmanager C library.
 
@@ -161,6 +528,34 @@ from typing import Any
 import ctypes.util
 import os
 import sys
+""")
+
+    resolve_ctype, ctype_to_pytype = make_type_resolvers(enums, typedef_map)
+
+    # Emit all function signatures once at module level, _setup_functions
+    # applies them to the loaded library. Identical argtypes tuples are
+    # interned into shared _SIG_<n> constants.
+    sig_pool: Dict[Tuple[str, ...], str] = {}
+    signatures = []
+    for func in functions:
+        argtypes = tuple(resolve_ctype(param['type'], is_return=False) for param in func['params'])
+        sig_name = sig_pool.get(argtypes)
+        if sig_name is None:
+            sig_name = sig_pool[argtypes] = f"_SIG_{len(sig_pool)}"
+        signatures.append((func['name'], sig_name, resolve_ctype(func['return_type'], is_return=True)))
+
+    out.write("\n# Shared argtypes tuples\n")
+    for argtypes, sig_name in sig_pool.items():
+        argtypes_tuple = f"({argtypes[0]},)" if len(argtypes) == 1 else f"({', '.join(argtypes)})"
+        out.write(f"{sig_name} = {argtypes_tuple}\n")
+
+    out.write("""
+# (function name, argtypes, restype) for every library function
+_SIGNATURES = (
+""")
+    for func_name, sig_name, restype in signatures:
+        out.write(f"    (\"{func_name}\", {sig_name}, {restype}),\n")
+    out.write(""")
 
 class EconfManager:
     \"\"\"
@@ -180,26 +575,16 @@ class EconfManager:
         self.lib = CDLL(lib_path)
         self._setup_types()
         self._setup_functions()
-"""
+""")
 
     # Add enum definitions as Enum classes
-    for enum_name, enum_values in enums.items():
-        python_code += f"\n    # {enum_name} enum\n"
-        python_code += f"    class {enum_name}(IntEnum):\n"
-
-        for value_name, value in enum_values.items():
-            if value is None:
-                # For enums without explicit values, assign sequential integers
-                index = list(enum_values.keys()).index(value_name)
-                python_code += f"        {value_name} = {index}\n"
-            else:
-                python_code += f"        {value_name} = {value}\n"
+    _generate_enum_classes(out, enums)
 
     # Add struct definitions at class level
     for struct_name, struct_content in structs:
-        python_code += f"\n    # {struct_name} struct\n"
-        python_code += f"    class {struct_name}(Structure):\n"
-        python_code += "        _fields_ = [\n"
+        out.write(f"\n    # {struct_name} struct\n")
+        out.write(f"    class {struct_name}(Structure):\n")
+        out.write("        _fields_ = [\n")
 
         # Parse struct fields
         for line in struct_content.split('\n'):
@@ -211,184 +596,399 @@ class EconfManager:
             if ';' in line:
                 field_decl = line.rstrip(';').strip()
                 if field_decl:
-                    python_code += f"            # {field_decl}\n"
+                    out.write(f"            # {field_decl}\n")
 
-        python_code += "        ]\n"
+        out.write("        ]\n")
 
     # Add typedefs at class level
     for typedef in typedefs:
-        python_code += f"\n    # {typedef}\n"
+        out.write(f"\n    # {typedef}\n")
         if 'POINTER' in typedef or 'Callback' in typedef or 'FFI' in typedef:
             # Handle pointer and callback types
             if 'ParameterUpdateCallbackFFI' in typedef:
-                python_code += "    ParameterUpdateCallbackFFI = CFUNCTYPE(None, c_int32, c_void_p)\n"
+                out.write("    ParameterUpdateCallbackFFI = CFUNCTYPE(None, c_int32, c_void_p)\n")
             elif 'CInterfaceInstance' in typedef:
-                python_code += "    CInterfaceInstancePtr = POINTER(CInterfaceInstance)\n"
-                python_code += "    CInterfaceInstancePtrPtr = POINTER(CInterfaceInstancePtr)\n"
+                out.write("    CInterfaceInstancePtr = POINTER(CInterfaceInstance)\n")
+                out.write("    CInterfaceInstancePtrPtr = POINTER(CInterfaceInstancePtr)\n")
 
     # Generate _setup_types method
-    python_code += """
+    out.write("""
     def _setup_types(self):
         \"\"\"
         Set up all the type definitions for the C library.
         \"\"\"
         # Types are already defined at class level
         pass
-"""
+""")
 
     # Generate _setup_functions method
-    python_code += """
+    out.write("""
     def _setup_functions(self):
         \"\"\"
         Set up all the function definitions for the C library.
         \"\"\"
-"""
-
-    # --- Type mapping for C types to ctypes ---
-    ctype_map = {
-        "void": "None",
-        "void*": "c_void_p",
-        "const void*": "c_void_p",
-        "char": "c_char",
-        "char*": "c_char_p",
-        "const char*": "c_char_p",
-        "int": "c_int",
-        "int32_t": "c_int32",
-        "int64_t": "c_int64",
-        "uint32_t": "c_uint32",
-        "uint64_t": "c_uint64",
-        "uintptr_t": "c_size_t",
-        "bool": "c_bool",
-        "size_t": "c_size_t",
-        "float": "c_float",
-        "double": "c_double",
-    }
+        for name, argtypes, restype in _SIGNATURES:
+            func = getattr(self.lib, name)
+            func.argtypes = argtypes
+            func.restype = restype
+""")
 
-    def resolve_ctype(c_type: str, is_return: bool = False) -> str:
-        t = c_type.strip()
-        t = t.replace("const ", "")
-        # Handle pointer types
-        if t.endswith("**"):
-            base = t[:-2].strip()
-            resolved = resolve_ctype(typedef_map.get(base, base))
-            return f"POINTER({resolved})"
-        if t.endswith("*"):
-            base = t[:-1].strip()
-            # Special case for char* (string)
-            if base == "char":
-                return "c_char_p"
-            resolved = resolve_ctype(typedef_map.get(base, base))
-            return f"POINTER({resolved})"
-        # Recursively resolve typedefs
-        while t in typedef_map:
-            t = typedef_map[t]
-        # Special case for enums (use c_int)
-        if t in enums:
-            return "c_int"
-        # Only use None for void return type, not for arguments
-        if t == "void":
-            return "None" if is_return else "c_void_p"
-        return ctype_map.get(t, f"c_void_p")
+    # Generate wrapper methods for each function
+    _generate_wrapper_methods(out, functions, ctype_to_pytype)
 
-    def ctype_to_pytype(c_type: str) -> str:
-        t = c_type.strip()
-        t = t.replace("const ", "")
-        if t.endswith("*"):
-            base = t[:-1].strip()
-            if base == "char":
-                return "str"
-            return "Any"
-        # Recursively resolve typedefs
-        while t in typedef_map:
-            t = typedef_map[t]
-        if t in enums:
-            return "int"
-        if t in ("int", "int32_t", "int64_t", "uint32_t", "uint64_t", "uintptr_t", "size_t"):
-            return "int"
-        if t in ("float", "double"):
-            return "float"
-        if t == "bool":
-            return "bool"
-        return "Any"
+    out.write("""
+if __name__ == "__main__":
+    # Example usage
+    econf = EconfManager()
+    print("EconfManager interface initialized successfully")
+""")
 
-    # Add function declarations to _setup_functions
-    for func in functions:
-        python_code += f"        # {func['name']}\n"
-        argtypes = []
-        for param in func['params']:
-            argtypes.append(resolve_ctype(param['type'], is_return=False))
-        python_code += f"        self.lib.{func['name']}.argtypes = [{', '.join(argtypes)}]\n"
-        return_type = func['return_type']
-        python_code += f"        self.lib.{func['name']}.restype = {resolve_ctype(return_type, is_return=True)}\n"
+def generate_cffi_interface(header_content: str, enums: Dict, functions: List, typedef_map: Dict, out: TextIO) -> None:
+    """
+    Generate Python interface code using cffi.
 
-    # Generate wrapper methods for each function
-    for func in functions:
-        func_name = func['name']
-        params = func['params']
+    Args:
+        header_content: Content of the header file, passed to ffi.cdef()
+        enums: Dictionary of enums
+        functions: List of function declarations
+        typedef_map: Mapping of custom typedefs to base types
+        out: File-like object the generated code is written to
+    """
+    cdef = strip_preprocessor(header_content).replace('\\', '\\\\')
 
-        # Extract parameter names and types
-        param_names = []
-        param_types = []
-        param_docs = []
+    out.write(f"""#!/usr/bin/env python3
+\"\"\"
+Python interface for the econfmanager C library (cffi backend).
 
-        for param in params:
-            param_type = param['type']
-            param_name = param['name']
+Generated automatically - DO NOT EDIT
+\"\"\"
 
-            param_names.append(param_name)
-            param_types.append(param_type)
+from cffi import FFI
+from enum import IntEnum
+from typing import Any
+import os
 
-            # Create documentation for the parameter
-            param_docs.append(f"            {param_name} ({param['full']}): Parameter")
+ffi = FFI()
+ffi.cdef(\"\"\"
+{cdef}\"\"\")
 
-        # Convert C types to Python types for type hints
-        python_types = []
-        for param_type in param_types:
-            python_types.append(ctype_to_pytype(param_type))
+class EconfManager:
+    \"\"\"
+    Python interface to the econfmanager C library.
+    \"\"\"
 
-        # Generate function signature with type hints
-        return_pytype = ctype_to_pytype(func['return_type'])
-        python_code += f"""
-    def {func_name}(self, {', '.join([f'{name}: {type}' for name, type in zip(param_names, python_types)])}) -> {return_pytype}:
+    def __init__(self, lib_path=None):
         \"\"\"
-        Wrapper for {func_name} function.
+        Initialize the econfmanager interface.
 
         Args:
-{chr(10).join(param_docs)}
-
-        Returns:
-            {return_pytype} result from the C function
+            lib_path: Path to the econfmanager library. If None, tries to find it automatically.
         \"\"\"
-        return self.lib.{func_name}({', '.join(param_names)})
-"""
+        if lib_path is None:
+            lib_path = os.path.join(os.path.dirname(__file__), 'libeconfmanager.so')
 
-    python_code += """
+        self.ffi = ffi
+        self.lib = ffi.dlopen(lib_path)
+""")
+
+    _generate_enum_classes(out, enums)
+
+    _, ctype_to_pytype = make_type_resolvers(enums, typedef_map)
+    _generate_wrapper_methods(out, functions, ctype_to_pytype)
+
+    out.write("""
 if __name__ == "__main__":
     # Example usage
     econf = EconfManager()
     print("EconfManager interface initialized successfully")
-"""
+""")
 
-    return python_code
+def generate_cython_interface(header_name: str, enums: Dict, functions: List, typedef_map: Dict, out: TextIO) -> None:
+    """
+    Generate a Cython (.pyx) interface module.
+
+    Pointers other than C strings are passed to and returned from the wrappers
+    as integer addresses.
+
+    Args:
+        header_name: Header file name used in the cdef extern block
+        enums: Dictionary of enums
+        functions: List of function declarations
+        typedef_map: Mapping of custom typedefs to base types
+        out: File-like object the generated code is written to
+    """
+    resolved_typedefs = resolve_typedef_chains(typedef_map)
+
+    # Enum typedefs are declared under a prefixed name so that the Python
+    # IntEnum classes can keep the C names
+    c_names = {name: f"_c_{name}" for name in enums}
+    # Aliases that resolve to a scalar type or an enum, declared as ctypedefs
+    scalar_typedefs = {}
+    for alias, base in resolved_typedefs.items():
+        if base in enums:
+            scalar_typedefs[alias] = c_names[base]
+        elif base in _CYTHON_SCALARS:
+            scalar_typedefs[alias] = base
+    known_types = _CYTHON_SCALARS.union(c_names, scalar_typedefs, ('void',))
+
+    def to_cython(decl: str) -> str:
+        if not c_names:
+            return decl
+        return _IDENTIFIER_RE.sub(lambda m: c_names.get(m.group(0), m.group(0)), decl)
+
+    def split_param(full: str) -> Tuple[str, str]:
+        name = _IDENTIFIER_RE.findall(full)[-1]
+        return full[:full.rfind(name)].strip(), name
+
+    # Types the header declares but the parser does not know about (opaque
+    # structs, function pointers) are declared opaquely: as structs when only
+    # used behind pointers, as pointer-sized handles when passed by value
+    opaque_types: Dict[str, bool] = {}
+    for func in functions:
+        used = [(func['return_type'], False)]
+        for param in func['params']:
+            param_type, _ = split_param(param['full'])
+            used.append((param_type.replace('*', ' ').replace('const ', ' ').strip(), '*' in param_type))
+        for base, is_pointer in used:
+            if base not in known_types:
+                opaque_types[base] = opaque_types.get(base, False) or not is_pointer
+
+    out.write(f"""# cython: language_level=3
+\"\"\"
+Python interface for the econfmanager C library (Cython backend).
+
+Generated automatically - DO NOT EDIT
+\"\"\"
+
+from enum import IntEnum
+from libc.stdint cimport int8_t, int16_t, int32_t, int64_t, uint8_t, uint16_t, uint32_t, uint64_t, uintptr_t
+
+cdef extern from "{header_name}":
+    ctypedef bint bool
+""")
+
+    for enum_name, enum_values in enums.items():
+        out.write(f"\n    ctypedef enum {c_names[enum_name]} \"{enum_name}\":\n")
+        for value_name in enum_values:
+            out.write(f"        {value_name}\n")
+
+    out.write("\n")
+    for alias, base in scalar_typedefs.items():
+        out.write(f"    ctypedef {base} {alias}\n")
+    for type_name, by_value in opaque_types.items():
+        if by_value:
+            out.write(f"    ctypedef void *{type_name}\n")
+        else:
+            out.write(f"    ctypedef struct {type_name}:\n        pass\n")
+
+    out.write("\n")
+    for func in functions:
+        c_params = ", ".join(to_cython(param['full']) for param in func['params'])
+        out.write(f"    {to_cython(func['return_type'])} _c_{func['name']} \"{func['name']}\"({c_params})\n")
+
+    _generate_enum_classes(out, enums, indent="")
+
+    for func in functions:
+        def_params = []
+        call_args = []
+        for param in func['params']:
+            param_type, param_name = split_param(param['full'])
+            base = param_type.replace('*', ' ').replace('const ', ' ').strip()
+            if param_type.count('*') == 1 and base == 'char' and 'const' in param_type.split():
+                # Input C strings are converted from bytes by Cython; writable
+                # char * buffers take the address path below
+                def_params.append(f"{param_type}{param_name}" if param_type.endswith('*') else f"{param_type} {param_name}")
+                call_args.append(param_name)
+            elif '*' in param_type or opaque_types.get(base):
+                def_params.append(f"uintptr_t {param_name}")
+                call_args.append(f"<{to_cython(param_type)}>{param_name}")
+            else:
+                def_params.append(to_cython(f"{param_type} {param_name}"))
+                call_args.append(param_name)
+
+        call = f"_c_{func['name']}({', '.join(call_args)})"
+        return_type = func['return_type']
+        if return_type == 'void':
+            body = call
+        elif opaque_types.get(return_type):
+            body = f"return <uintptr_t>{call}"
+        else:
+            body = f"return {call}"
+
+        out.write(f"""
+def {func['name']}({', '.join(def_params)}):
+    \"\"\"
+    Wrapper for {func['name']} function.
+    \"\"\"
+    {body}
+""")
+
+def parse_cache_path(header_content: str) -> str:
+    """
+    Get the parse cache file for a header.
+
+    The key covers the header content and the generator source, so editing
+    either of them invalidates the cache.
+
+    Args:
+        header_content: Content of the header file
+
+    Returns:
+        Path of the cache file under ~/.cache/econfmanager (or $XDG_CACHE_HOME)
+    """
+    digest = hashlib.blake2b(header_content.encode(), digest_size=16)
+    with open(__file__, 'rb') as f:
+        digest.update(f.read())
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'econfmanager', f"{digest.hexdigest()}.pkl")
+
+def output_record(output_file: str, backend: str, header_name: str) -> Tuple[str, str, int, int]:
+    """
+    Describe a generated output file for the parse cache skip check.
+
+    Besides the header content and generator source covered by the cache key,
+    the record holds every input the output depends on.
+
+    Args:
+        output_file: Path of the generated file
+        backend: Backend the file was generated with
+        header_name: Header file name, used by the Cython cdef extern block
+
+    Returns:
+        Tuple of the backend, header name, modification time (ns) and size of the file
+    """
+    st = os.stat(output_file)
+    return backend, header_name, st.st_mtime_ns, st.st_size
+
+def load_parse_cache(cache_file: str) -> Optional[Dict]:
+    """
+    Load a parse cache entry.
+
+    The entry holds the parse_header result under 'parsed' and, under
+    'outputs', the output_record of every file generated from it keyed by
+    absolute path.
+
+    Args:
+        cache_file: Path of the cache file
+
+    Returns:
+        Cache entry, or None if it is missing or unreadable
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            entry = pickle.load(f)
+        if not isinstance(entry, dict) or 'parsed' not in entry or 'outputs' not in entry:
+            raise ValueError("unexpected cache entry format")
+        return entry
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable parse cache %s: %s", cache_file, e)
+        return None
+
+def store_parse_cache(cache_file: str, entry: Dict) -> None:
+    """
+    Store a parse cache entry and prune the least recently used entries.
+
+    The entry is written to a temporary file and moved into place, so
+    concurrent runs never read a partial entry. Failures only produce a warning.
+
+    Args:
+        cache_file: Path of the cache file
+        entry: Cache entry, see load_parse_cache
+    """
+    cache_dir = os.path.dirname(cache_file)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+    except OSError as e:
+        logger.warning("Could not write parse cache %s: %s", cache_file, e)
+        return
+
+    prune_parse_cache(cache_dir)
+
+def prune_parse_cache(cache_dir: str) -> None:
+    """
+    Keep only the PARSE_CACHE_MAX_ENTRIES most recently used cache entries.
+
+    Args:
+        cache_dir: Parse cache directory
+    """
+    try:
+        entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith('.pkl')]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for stale in entries[PARSE_CACHE_MAX_ENTRIES:]:
+            os.remove(stale)
+    except OSError as e:
+        # Entries may be removed by a concurrent run
+        logger.debug("Could not prune parse cache %s: %s", cache_dir, e)
 
 def main():
     """Main function to read header file and generate Python interface."""
-    if len(sys.argv) != 3:
-        print("Usage: python generate_python_interface.py <header_file> <output_file>")
-        sys.exit(1)
-
-    header_file = sys.argv[1]
-    output_file = sys.argv[2]
+    parser = argparse.ArgumentParser(description="Generate Python interface for the econfmanager C library.")
+    parser.add_argument("header_file", help="econfmanager C header file")
+    parser.add_argument("output_file", help="Generated Python (or .pyx for the cython backend) file")
+    parser.add_argument("--backend", choices=BACKENDS, default="ctypes",
+                        help="FFI used by the generated interface (default: ctypes)")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, default=True,
+                        help="Reuse the parse result of unchanged headers and skip up-to-date outputs. "
+                             f"Keeps the {PARSE_CACHE_MAX_ENTRIES} most recently used entries in ~/.cache/econfmanager "
+                             "(default: enabled)")
+    args = parser.parse_args()
+
+    header_file = args.header_file
+    output_file = args.output_file
 
     try:
         with open(header_file, 'r') as f:
             header_content = f.read()
 
-        enums, structs, typedefs, functions, typedef_map = parse_header(header_content)
-        python_code = generate_python_interface(enums, structs, typedefs, functions, typedef_map)
-
-        with open(output_file, 'w') as f:
-            f.write(python_code)
+        entry = None
+        cache_file = None
+        output_key = os.path.abspath(output_file)
+        if args.cache:
+            cache_file = parse_cache_path(header_content)
+            entry = load_parse_cache(cache_file)
+            # Skip only if this exact output file was last generated from this
+            # header with the same backend and has not been touched since
+            if (entry is not None and os.path.exists(output_file)
+                    and entry['outputs'].get(output_key) == output_record(output_file, args.backend, os.path.basename(header_file))):
+                # Mark the entry as recently used for pruning
+                os.utime(cache_file)
+                print(f"Python interface in {output_file} is up to date")
+                return
+
+        if entry is None:
+            entry = {'parsed': parse_header(header_content), 'outputs': {}}
+        enums, structs, typedefs, functions, typedef_map = entry['parsed']
+
+        # Generated code is streamed to a temporary file next to the output and
+        # only moved into place once generation succeeded
+        tmp_file = output_file + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                if args.backend == "cffi":
+                    generate_cffi_interface(header_content, enums, functions, typedef_map, f)
+                elif args.backend == "cython":
+                    generate_cython_interface(os.path.basename(header_file), enums, functions, typedef_map, f)
+                else:
+                    generate_python_interface(enums, structs, typedefs, functions, typedef_map, f)
+            os.replace(tmp_file, output_file)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+
+        if cache_file is not None:
+            entry['outputs'][output_key] = output_record(output_file, args.backend, os.path.basename(header_file))
+            store_parse_cache(cache_file, entry)
 
         print(f"Successfully generated Python interface in {output_file}")
 